@@ -1,24 +1,68 @@
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import threading
+import time
 import json
 
-from supabase import create_client
-from config import settings
+from supabase_client import get_supabase
+
+# -------------------------------------------------------------------
+# 0) Shared HTTP session with global and per-subdomain limits
+# -------------------------------------------------------------------
+
+class BandcampConnectionPool:
+    """
+    A pooled requests.Session shared by all artists of a bulk import.
+    At most `max_connections` requests are in flight overall and at most
+    `per_host` against any single subdomain (e.g. "artist.bandcamp.com").
+    Exposes `get(url)` so it can be passed wherever `requests` is used.
+    """
+
+    def __init__(self, max_connections=8, per_host=2, timeout=30):
+        self.timeout = timeout
+        self.per_host = per_host
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=max_connections, pool_maxsize=max_connections
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._global_slots = threading.BoundedSemaphore(max_connections)
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def _slots_for(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        # Take the host slot first so a busy subdomain never holds a global slot while waiting.
+        with self._slots_for(url), self._global_slots:
+            return self.session.get(url, **kwargs)
+
+    def close(self):
+        self.session.close()
 
-# Create your Supabase client
-supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
 
 # -------------------------------------------------------------------
 # 1) Parse the main Bandcamp "artist/music" page
 # -------------------------------------------------------------------
 
-def fetch_bandcamp_main_page(url):
+def fetch_bandcamp_main_page(url, http=requests):
     """
     Simple helper to fetch the raw HTML of the Bandcamp main/music page.
+    `http` can be a BandcampConnectionPool to share connections between artists.
     """
     try:
-        resp = requests.get(url)
+        resp = http.get(url)
         resp.raise_for_status()
         return resp.text
     except requests.exceptions.RequestException as e:
@@ -136,12 +180,12 @@ def parse_bandcamp_main_page(html_content):
 # 2) Parse an individual Bandcamp album/track page
 # -------------------------------------------------------------------
 
-def fetch_bandcamp_html(url):
+def fetch_bandcamp_html(url, http=requests):
     """
     Fetches the raw HTML content from a Bandcamp album or track page.
     """
     try:
-        response = requests.get(url)
+        response = http.get(url)
         if response.status_code == 200:
             return response.text
         else:
@@ -309,9 +353,9 @@ def parse_bandcamp_html(html_content):
 # 3) Insert user and digital releases into Supabase
 # -------------------------------------------------------------------
 
-def create_bandcamp_user_in_supabase_from_main(parsed_data):
+def build_bandcamp_user_payload(parsed_data):
     """
-    Creates a new 'users' record from the main page's parsed_data
+    Builds the 'users' record for the main page's parsed_data
     (profile banner, profile pic, artist name, etc.).
     """
     # Some fields in the 'users' table:
@@ -332,7 +376,7 @@ def create_bandcamp_user_in_supabase_from_main(parsed_data):
     slug_email = artist_name.replace(" ", "_").lower()
     if " " in artist_name:
         artist_name= artist_name.replace(" ", "")
-    user_payload = {
+    return {
         "username": artist_name,  # or slug_email
         "display_name": artist_name,
         "email": f"{slug_email}@dummy-bandcamp.com",   # placeholder
@@ -346,8 +390,14 @@ def create_bandcamp_user_in_supabase_from_main(parsed_data):
         # or add another field "location" if your schema allows
     }
 
+
+def create_bandcamp_user_in_supabase_from_main(parsed_data):
+    """
+    Creates a new 'users' record from the main page's parsed_data.
+    """
+    user_payload = build_bandcamp_user_payload(parsed_data)
     try:
-        response = supabase.table("users").insert(user_payload).execute()
+        response = get_supabase().table("users").insert(user_payload).execute()
         if response.data:
             return response.data[0]["id"]  # The newly created user's UUID
         else:
@@ -357,9 +407,9 @@ def create_bandcamp_user_in_supabase_from_main(parsed_data):
         raise e
 
 
-def upload_bandcamp_release_to_supabase(parsed_data, user_id):
+def build_bandcamp_ticket_payload(parsed_data, user_id):
     """
-    Insert one Bandcamp album/track (parsed_data) into the 'tickets' table,
+    Build the 'tickets' record for one Bandcamp album/track (parsed_data),
     referencing 'main_creator_id' = user_id.
     """
     
@@ -372,7 +422,7 @@ def upload_bandcamp_release_to_supabase(parsed_data, user_id):
         long_description = parsed_data.get("long_description")
     
     
-    ticket_payload = {
+    return {
         "event_date": parsed_data.get("event_date"),
         "title": parsed_data.get("title"),
         "cover_image": parsed_data.get("cover_image"),
@@ -391,8 +441,15 @@ def upload_bandcamp_release_to_supabase(parsed_data, user_id):
         "co_creator_name": parsed_data.get("co_creator_name", None),
         "main_creator_name": parsed_data.get("creators") or None,
     }
+
+
+def upload_bandcamp_release_to_supabase(parsed_data, user_id):
+    """
+    Insert one Bandcamp album/track (parsed_data) into the 'tickets' table.
+    """
+    ticket_payload = build_bandcamp_ticket_payload(parsed_data, user_id)
     try:
-        response = supabase.table("tickets").insert(ticket_payload).execute()
+        response = get_supabase().table("tickets").insert(ticket_payload).execute()
         if response.data:
             return {"ticket_id": response.data[0]["id"]}
         else:
@@ -406,57 +463,272 @@ def upload_bandcamp_release_to_supabase(parsed_data, user_id):
 # 4) High-level workflow: parse main page, create user, parse each release
 # -------------------------------------------------------------------
 
-def import_bandcamp_artist_and_releases(bandcamp_base_url):
+def new_import_report(bandcamp_base_url, dry_run=False):
+    """
+    An empty per-artist report (see print_import_report).
+    """
+    report = {
+        "url": bandcamp_base_url,
+        "artist_name": None,
+        "user_id": None,
+        "imported": 0,
+        "failures": [],
+        "error": None,
+        "seconds": 0.0,
+    }
+    if dry_run:
+        report["user"] = None
+        report["tickets"] = []
+    return report
+
+
+def import_bandcamp_artist_and_releases(bandcamp_base_url, http=requests, release_executor=None, dry_run=False,
+                                        report=None):
     """
     1) Parse the main '.../music' page to get the artist data and release URLs.
     2) Create the user in Supabase.
     3) For each release (album or track link), fetch & parse, 
        then upload as a digital 'ticket' to Supabase.
+
+    When `release_executor` is given, release pages are fetched through it
+    concurrently, at most `http.per_host` at a time, so this artist never
+    occupies executor workers that would only wait on its subdomain's limit.
+    Uploads still happen in order on the calling thread.
+    Returns a report dict for the artist (see print_import_report).
+    With `dry_run` nothing is written to Supabase; the user and ticket
+    payloads are collected in the report's "user" and "tickets" instead.
+    Pass `report` to have it filled in place, so progress made before an
+    exception is not lost.
     """
+    started = time.perf_counter()
+    if report is None:
+        report = new_import_report(bandcamp_base_url, dry_run)
+
     # 1) Parse main page
-    main_html = fetch_bandcamp_main_page(bandcamp_base_url)
+    main_html = fetch_bandcamp_main_page(bandcamp_base_url, http)
     if not main_html:
         print("No HTML content retrieved from the main page, aborting.")
-        return
+        report["error"] = "No HTML content retrieved from the main page"
+        report["seconds"] = time.perf_counter() - started
+        return report
 
     parsed_main = parse_bandcamp_main_page(main_html)
+    report["artist_name"] = parsed_main["artist_name"]
     if not parsed_main["artist_name"]:
         print("Could not determine artist name from main page.")
     
     # 2) Create user in Supabase (the Bandcamp artist)
-    user_id = create_bandcamp_user_in_supabase_from_main(parsed_main)
-    print(f"New user created in Supabase for artist '{parsed_main['artist_name']}' => {user_id}")
+    if dry_run:
+        user_id = None
+        report["user"] = build_bandcamp_user_payload(parsed_main)
+    else:
+        user_id = create_bandcamp_user_in_supabase_from_main(parsed_main)
+        report["user_id"] = user_id
+        print(f"New user created in Supabase for artist '{parsed_main['artist_name']}' => {user_id}")
 
     # 3) For each release, fetch & parse
     base_domain = bandcamp_base_url.split("/music")[0]  # e.g. "https://kourosh666.bandcamp.com"
-    total_imported = 0
-
-    for release in parsed_main["music_releases"]:
+    release_urls = [
         # Construct a full URL from the relative
         # e.g. base_domain + "/album/shocked-ep"
-        full_release_url = requests.compat.urljoin(base_domain, release["url"])
+        requests.compat.urljoin(base_domain, release["url"])
+        for release in parsed_main["music_releases"]
+    ]
+    if release_executor is not None:
+        # Take the per-host slot before submitting: a queued task for a busy
+        # subdomain would otherwise hold a shared worker while it waits.
+        host_slots = threading.BoundedSemaphore(getattr(http, "per_host", 2))
+        pending = []
+        for url in release_urls:
+            host_slots.acquire()
+            future = release_executor.submit(fetch_bandcamp_html, url, http)
+            future.add_done_callback(lambda _: host_slots.release())
+            pending.append(future)
+        release_pages = (future.result() for future in pending)
+    else:
+        release_pages = (fetch_bandcamp_html(url, http) for url in release_urls)
+
+    for full_release_url, release_html in zip(release_urls, release_pages):
         print(f"\nFetching release: {full_release_url}")
-        
-        release_html = fetch_bandcamp_html(full_release_url)
         if not release_html:
             print("Could not retrieve HTML for this release, skipping.")
+            report["failures"].append({"url": full_release_url, "error": "fetch failed"})
             continue
         
         # parse_bandcamp_html returns a list of items (1 item for track or album)
-        release_items = parse_bandcamp_html(release_html)
+        try:
+            release_items = parse_bandcamp_html(release_html)
+        except Exception as e:
+            print(f"Could not parse this release, skipping: {e}")
+            report["failures"].append({"url": full_release_url, "error": f"parse failed: {e}"})
+            continue
         for item in release_items:
             # item is a dict with keys: title, cover_image, short_description, ...
-            upload_bandcamp_release_to_supabase(item, user_id)
-            total_imported += 1
+            if dry_run:
+                report["tickets"].append(build_bandcamp_ticket_payload(item, user_id))
+                report["imported"] += 1
+                continue
+            try:
+                upload_bandcamp_release_to_supabase(item, user_id)
+            except Exception as e:
+                report["failures"].append({"url": full_release_url, "error": str(e)})
+                continue
+            report["imported"] += 1
     
-    print(f"\nDone! Imported {total_imported} release(s) for artist '{parsed_main['artist_name']}'.")
+    print(f"\nDone! Imported {report['imported']} release(s) for artist '{parsed_main['artist_name']}'.")
+    report["seconds"] = time.perf_counter() - started
+    return report
 
 
 # -------------------------------------------------------------------
-# 5) Example usage
+# 5) Label / bulk import: many artists concurrently
 # -------------------------------------------------------------------
 
+def normalize_bandcamp_artist_url(url):
+    """
+    Turn any artist link (".../?label=123&tab=artists", a bare host, ...)
+    into the artist's '.../music' page URL.
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/music"
+
+
+def parse_bandcamp_label_artists_page(html_content, label_url):
+    """
+    Parse a label's '.../artists' page and return the '.../music' URL of
+    every artist on the roster (featured and regular grid), without duplicates.
+    """
+    soup = BeautifulSoup(html_content, "html.parser")
+    label_host = urlsplit(label_url).netloc
+
+    artist_urls = []
+    for li in soup.find_all("li", class_=["artists-grid-item", "featured-item"]):
+        link = li.find("a", href=True)
+        if not link:
+            continue
+        # Relative links point back at the label itself.
+        href = requests.compat.urljoin(label_url, link["href"])
+        if urlsplit(href).netloc == label_host:
+            continue
+        artist_url = normalize_bandcamp_artist_url(href)
+        if artist_url not in artist_urls:
+            artist_urls.append(artist_url)
+
+    return artist_urls
+
+
+def discover_bandcamp_label_artists(label_url, http=requests):
+    """
+    Fetch a label's artists page (e.g. "https://somelabel.bandcamp.com")
+    and return the artists' '.../music' URLs.
+    """
+    parts = urlsplit(normalize_bandcamp_artist_url(label_url))
+    artists_page_url = f"{parts.scheme}://{parts.netloc}/artists"
+    html_content = fetch_bandcamp_main_page(artists_page_url, http)
+    if not html_content:
+        return []
+    return parse_bandcamp_label_artists_page(html_content, artists_page_url)
+
+
+def read_bandcamp_artist_list(path):
+    """
+    Read artist URLs from a text file, one per line. Blank lines and
+    lines starting with '#' are ignored.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        lines = [line.strip() for line in file]
+    return [normalize_bandcamp_artist_url(line) for line in lines if line and not line.startswith("#")]
+
+
+def collect_bandcamp_artist_urls(artist_urls=(), label_urls=(), input_path=None, http=requests):
+    """
+    Combine artist URLs given directly, read from `input_path` and discovered
+    on label pages into one list of '.../music' URLs, keeping the first
+    occurrence of each artist.
+    """
+    collected = [normalize_bandcamp_artist_url(url) for url in artist_urls]
+    if input_path:
+        collected.extend(read_bandcamp_artist_list(input_path))
+    for label_url in label_urls:
+        collected.extend(discover_bandcamp_label_artists(label_url, http))
+    return list(dict.fromkeys(collected))
+
+
+def import_bandcamp_artists(artist_urls, max_artists=4, max_connections=8, per_host=2, dry_run=False, http=None):
+    """
+    Import many artists concurrently. All artists share one pooled HTTP
+    session; `max_connections` caps requests in flight overall and
+    `per_host` caps them per artist subdomain. Pass `http` to reuse a
+    BandcampConnectionPool (e.g. the one used for label discovery); it is
+    then left open for the caller. Returns one report per artist, in input order.
+    """
+    started = time.perf_counter()
+    owns_http = http is None
+    if owns_http:
+        http = BandcampConnectionPool(max_connections=max_connections, per_host=per_host)
+
+    def run(url):
+        artist_started = time.perf_counter()
+        report = new_import_report(url, dry_run)
+        try:
+            import_bandcamp_artist_and_releases(url, http, release_executor, dry_run, report)
+        except Exception as e:
+            # Keep what was already imported (user, tickets) in the report
+            report["error"] = str(e)
+            report["seconds"] = time.perf_counter() - artist_started
+        return report
+
+    # Releases get their own executor so artist workers waiting on release
+    # fetches can never starve the pool they are waiting on.
+    try:
+        with ThreadPoolExecutor(max_workers=max_connections) as release_executor, \
+                ThreadPoolExecutor(max_workers=max_artists) as artist_executor:
+            reports = list(artist_executor.map(run, artist_urls))
+    finally:
+        if owns_http:
+            http.close()
+
+    print_import_report(reports, time.perf_counter() - started)
+    return reports
+
+
+def print_import_report(reports, total_seconds=None):
+    """
+    Print one consolidated summary: per-artist release count, timing and failures.
+    """
+    print("\n" + "=" * 80)
+    print("Bandcamp import report")
+    print("=" * 80)
+    for report in reports:
+        name = report["artist_name"] or report["url"]
+        status = f"FAILED ({report['error']})" if report["error"] else f"{report['imported']} release(s)"
+        print(f"{name}: {status} in {report['seconds']:.1f}s")
+        for failure in report["failures"]:
+            print(f"    - {failure['url']}: {failure['error']}")
+
+    imported = sum(report["imported"] for report in reports)
+    failed_artists = sum(1 for report in reports if report["error"])
+    failed_releases = sum(len(report["failures"]) for report in reports)
+    print("-" * 80)
+    print(f"Artists: {len(reports)} ({failed_artists} failed), "
+          f"releases imported: {imported} ({failed_releases} failed)")
+    if total_seconds is not None:
+        print(f"Total time: {total_seconds:.1f}s")
+
+
+# -------------------------------------------------------------------
+# 6) Command-line usage
+# -------------------------------------------------------------------
+
+def main():
+    # Kept for `python bandcampuser.py ...`; the options live in cli.py's `bandcamp` command
+    from cli import main as cli_main
+
+    cli_main(["bandcamp", *sys.argv[1:]])
+
+
 if __name__ == "__main__":
-    # Example: "https://kourosh666.bandcamp.com/music"
-    bandcamp_url = "https://auralconduct.bandcamp.com/music"
-    import_bandcamp_artist_and_releases(bandcamp_url)
+    main()
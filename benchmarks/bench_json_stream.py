@@ -0,0 +1,107 @@
+"""
+Peak-memory comparison: decoding a large GET_EVENT_LISTINGS response with
+response.json() versus streaming it with json_stream.iter_json_array.
+
+The response body is generated chunk by chunk, the way it arrives from the
+network, so neither side starts with the body already in memory.
+
+    python benchmarks/bench_json_stream.py [page_size ...]
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from json_stream import iter_json_array  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+
+
+def make_listing(i):
+    return {
+        "id": str(i),
+        "listingDate": "2024-05-01T00:00:00.000Z",
+        "event": {
+            "id": str(1000000 + i),
+            "date": "2024-05-01T00:00:00.000",
+            "startTime": "2024-05-01T23:00:00.000",
+            "endTime": "2024-05-02T06:00:00.000",
+            "title": f"Event number {i} with a reasonably long title",
+            "contentUrl": f"/events/{1000000 + i}",
+            "flyerFront": f"https://images.ra.co/flyer_{i}.jpg",
+            "isTicketed": True,
+            "attending": i % 500,
+            "images": [
+                {"id": str(i * 10 + n), "filename": f"https://images.ra.co/{i}_{n}.jpg",
+                 "alt": "flyer", "type": "FLYERFRONT", "crop": None, "__typename": "Image"}
+                for n in range(4)
+            ],
+            "pick": None,
+            "venue": {"id": "137474", "name": "Some Venue", "contentUrl": "/clubs/137474",
+                      "live": True, "__typename": "Venue"},
+            "artists": [
+                {"id": str(i * 100 + n), "name": f"Artist {n}", "__typename": "Artist"}
+                for n in range(8)
+            ],
+            "__typename": "Event",
+        },
+        "__typename": "EventListing",
+    }
+
+
+def body_chunks(page_size):
+    """Yield the response body in CHUNK_SIZE pieces, generating listings lazily."""
+    def text_parts():
+        yield '{"data": {"eventListings": {"data": ['
+        for i in range(page_size):
+            yield ("," if i else "") + json.dumps(make_listing(i))
+        yield f'], "totalResults": {page_size}, "__typename": "EventListings"}}}}}}'
+
+    pending = b""
+    for part in text_parts():
+        pending += part.encode("utf-8")
+        while len(pending) >= CHUNK_SIZE:
+            yield pending[:CHUNK_SIZE]
+            pending = pending[CHUNK_SIZE:]
+    if pending:
+        yield pending
+
+
+def decode_full(page_size):
+    # What requests does for response.json(): join the body, decode the text, parse it.
+    content = b"".join(body_chunks(page_size))
+    text = content.decode("utf-8")
+    listings = json.loads(text)["data"]["eventListings"]["data"]
+    return sum(1 for _ in listings)
+
+
+def decode_streaming(page_size):
+    return sum(1 for _ in iter_json_array(body_chunks(page_size), ("data", "eventListings", "data")))
+
+
+def measure(func, page_size):
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = func(page_size)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, peak, seconds
+
+
+def main():
+    page_sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000]
+    print(f"{'pageSize':>9} {'full peak':>12} {'stream peak':>12} {'full s':>8} {'stream s':>9}")
+    for page_size in page_sizes:
+        full_count, full_peak, full_seconds = measure(decode_full, page_size)
+        stream_count, stream_peak, stream_seconds = measure(decode_streaming, page_size)
+        assert full_count == stream_count == page_size
+        print(f"{page_size:>9} {full_peak / 2**20:>10.1f}MB {stream_peak / 2**20:>10.1f}MB "
+              f"{full_seconds:>8.2f} {stream_seconds:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
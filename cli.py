@@ -0,0 +1,150 @@
+import argparse
+import contextlib
+import json
+import sys
+
+# Only the standard library is imported here. Each command imports the modules
+# it needs when it runs, and the Supabase client is only created on the first
+# write, so `--help`, `export`, `listings` and `--dry-run` need no credentials.
+
+
+def _listing_dates(args):
+    return f"{args.start_date}T00:00:00.000Z", f"{args.end_date}T23:59:59.999Z"
+
+
+def _progress_output(args):
+    # Dry-run JSON on stdout must stay parseable, so progress goes to stderr then
+    if args.dry_run and not args.output:
+        return contextlib.redirect_stdout(sys.stderr)
+    return contextlib.nullcontext()
+
+
+def _write_payloads(payloads, output_file):
+    if output_file:
+        with open(output_file, "w", encoding="utf-8") as file:
+            json.dump(payloads, file, indent=2)
+        print(f"Wrote dry-run payloads to {output_file}.")
+    else:
+        json.dump(payloads, sys.stdout, indent=2)
+        print()
+
+
+def run_venue(args):
+    from event_fetcher import fetch_and_upload_venue_events
+
+    with _progress_output(args):
+        result = fetch_and_upload_venue_events(args.venue_id, args.event_limit, dry_run=args.dry_run)
+    if args.dry_run:
+        _write_payloads(result, args.output)
+
+
+def run_listings(args):
+    from event_fetcher import EventListingsFetcher, print_listing_details
+
+    fetcher = EventListingsFetcher(args.areas, *_listing_dates(args), page_size=args.page_size)
+    for listing in fetcher.iter_all_events():
+        print_listing_details(listing)
+
+
+def run_export(args):
+    from event_fetcher import EventListingsFetcher, save_listings
+
+    fetcher = EventListingsFetcher(args.areas, *_listing_dates(args), page_size=args.page_size)
+    count = save_listings(fetcher.iter_all_events(), args.output)
+    print(f"Saved {count} events to {args.output}.")
+
+
+def run_bandcamp(args):
+    from bandcampuser import BandcampConnectionPool, collect_bandcamp_artist_urls, import_bandcamp_artists
+
+    # One pool for label discovery and the import, so both get its limits and timeout
+    http = BandcampConnectionPool(max_connections=args.max_connections, per_host=args.per_host)
+    try:
+        with _progress_output(args):
+            artist_urls = collect_bandcamp_artist_urls(args.artist_urls, args.label, args.input, http)
+            if not artist_urls:
+                args.parser.error("no artists given; pass artist URLs, --label or --input")
+
+            reports = import_bandcamp_artists(
+                artist_urls,
+                max_artists=args.max_artists,
+                max_connections=args.max_connections,
+                per_host=args.per_host,
+                dry_run=args.dry_run,
+                http=http,
+            )
+    finally:
+        http.close()
+    if args.dry_run:
+        payloads = [
+            {"url": report["url"], "user": report.get("user"), "tickets": report.get("tickets", [])}
+            for report in reports
+        ]
+        _write_payloads(payloads, args.output)
+
+
+def _add_listing_arguments(parser):
+    parser.add_argument("areas", type=int, help="The area code to filter events.")
+    parser.add_argument("start_date", type=str, help="The start date for event listings (inclusive, format: YYYY-MM-DD).")
+    parser.add_argument("end_date", type=str, help="The end date for event listings (inclusive, format: YYYY-MM-DD).")
+    parser.add_argument("--page-size", type=int, default=20, help="Listings per request (default: 20).")
+
+
+def _add_dry_run_arguments(parser):
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Build the user and ticket payloads without touching the database.")
+    parser.add_argument("-o", "--output", type=str,
+                        help="Write the dry-run payloads to this JSON file instead of stdout (requires --dry-run).")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Fetch events from RA.co and releases from Bandcamp, and import them into Supabase."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    venue = subparsers.add_parser("venue", help="Import an RA.co venue and its latest events as tickets.")
+    venue.add_argument("venue_id", type=str, help="The ID of the RA.co venue (e.g., 137474).")
+    venue.add_argument("--event-limit", type=int, default=50, help="Number of latest events to fetch (default: 50).")
+    _add_dry_run_arguments(venue)
+    venue.set_defaults(func=run_venue)
+
+    listings = subparsers.add_parser("listings", help="Print RA.co event listings for an area.")
+    _add_listing_arguments(listings)
+    listings.set_defaults(func=run_listings)
+
+    export = subparsers.add_parser("export", help="Save RA.co event listings to a CSV or JSON file.")
+    _add_listing_arguments(export)
+    export.add_argument("-o", "--output", type=str, default="events.csv",
+                        help="The output file path; .json writes JSON (default: events.csv).")
+    export.set_defaults(func=run_export)
+
+    bandcamp = subparsers.add_parser("bandcamp", help="Import Bandcamp artists, labels or artist lists.")
+    bandcamp.add_argument("artist_urls", nargs="*",
+                          help="Artist URLs (e.g. https://kourosh666.bandcamp.com/music).")
+    bandcamp.add_argument("--label", action="append", default=[],
+                          help="Label URL; every artist on its artists page is imported. Can be repeated.")
+    bandcamp.add_argument("--input", help="Text file with one artist URL per line.")
+    bandcamp.add_argument("--max-artists", type=int, default=4,
+                          help="Artists imported at the same time (default: 4).")
+    bandcamp.add_argument("--max-connections", type=int, default=8,
+                          help="Maximum concurrent HTTP requests overall (default: 8).")
+    bandcamp.add_argument("--per-host", type=int, default=2,
+                          help="Maximum concurrent HTTP requests per subdomain (default: 2).")
+    _add_dry_run_arguments(bandcamp)
+    bandcamp.set_defaults(func=run_bandcamp, parser=bandcamp)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # export has its own -o; for venue/bandcamp it only names the dry-run file
+    if getattr(args, "dry_run", None) is False and args.output:
+        parser.error(f"{args.command}: -o/--output is only used with --dry-run")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,19 @@
 # app/utils/config.py
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
 
-load_dotenv()
 
 class Settings:
-    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
-    SUPABASE_URL: str = os.getenv("REACT_APP_SUPABASE_URL")
-    SUPABASE_ANON_KEY: str = os.getenv("REACT_APP_SUPABASE_ANON_KEY")
+    def __init__(self):
+        self.OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
+        self.SUPABASE_URL: str = os.getenv("REACT_APP_SUPABASE_URL")
+        self.SUPABASE_ANON_KEY: str = os.getenv("REACT_APP_SUPABASE_ANON_KEY")
 
 
+@lru_cache(maxsize=None)
+def get_settings():
+    # .env is only read the first time settings are actually needed
+    from dotenv import load_dotenv
 
-settings = Settings()
-
+    load_dotenv()
+    return Settings()
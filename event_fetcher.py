@@ -2,38 +2,42 @@
 
 
 import requests
-import argparse
-from supabase import create_client
-from config import settings
+import sys
+import csv
+import json
+import time
+from json_stream import iter_json_array
+from supabase_client import get_supabase
 
 
-
-
-supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
-
 URL = "https://ra.co/graphql"
 HEADERS = {
     "Content-Type": "application/json",
     "Referer": "https://ra.co/",
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
 }
-
-# Initialize your Supabase client globally
-# supabase: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
+QUERY_TEMPLATE_PATH = "graphql_query_template.json"
+# Bytes read per step when streaming a response; only this much raw body is held at once.
+STREAM_CHUNK_SIZE = 64 * 1024
+DELAY = 1  # Seconds between listing pages; adjust this value as needed
 
 class VenueFetcher:
-    def __init__(self, venue_id):
+    def __init__(self, venue_id, event_limit=50):
         self.venue_id = venue_id
+        self.event_limit = event_limit
 
-    def get_venue_details(self):
-        payload = {
+    def generate_payload(self):
+        return {
             "operationName": "GET_VENUE_MOREON",
             "variables": {
                 "excludeEventId": "0",
                 "id": self.venue_id,
+                "limit": self.event_limit,
             },
+            # `events` must stay the last field of `venue`: the streaming path
+            # relies on the venue's own fields arriving before its events.
             "query": """
-            query GET_VENUE_MOREON($id: ID!, $excludeEventId: ID = 0) {
+            query GET_VENUE_MOREON($id: ID!, $excludeEventId: ID = 0, $limit: Int = 50) {
                 venue(id: $id) {
                     id
                     name
@@ -49,7 +53,7 @@ class VenueFetcher:
                         contentUrl
                     }
                     eventCountThisYear
-                    events(limit: 50, type: LATEST, excludeIds: [$excludeEventId]) {
+                    events(limit: $limit, type: LATEST, excludeIds: [$excludeEventId]) {
                         id
                         title
                         interestedCount
@@ -91,25 +95,137 @@ class VenueFetcher:
             """,
         }
 
-        response = requests.post(URL, headers=HEADERS, json=payload)
-        try:
-            response.raise_for_status()
-            data = response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Request failed: {e}")
-            raise
-        except ValueError:
-            print("Failed to decode JSON response")
-            raise
-
-        if "data" not in data or "venue" not in data["data"]:
+    def get_venue_details(self):
+        """
+        Return the venue with all of its events in "events", built on the
+        streaming decoder so the raw body is never held in memory as a whole.
+        """
+        venue = {}
+        events = list(self.iter_venue_events(venue))
+        venue["events"] = events
+        return venue
+
+    def iter_venue_events(self, venue):
+        """
+        Stream the venue query and yield its events one at a time while the
+        response body arrives, instead of decoding the whole body at once.
+        The venue's own fields (name, address, ...) are stored in `venue`
+        before the first event is yielded.
+        """
+        payload = self.generate_payload()
+        with requests.post(URL, headers=HEADERS, json=payload, stream=True) as response:
+            try:
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                print(f"Request failed: {e}")
+                raise
+
+            chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+            document = {}
+            try:
+                yield from iter_json_array(chunks, ("data", "venue", "events"), siblings=venue, root=document)
+            except ValueError:
+                print("Failed to decode JSON response")
+                raise
+
+        if "errors" in document:
+            print(f"Error: {document['errors']}")
+        if not venue:
             raise ValueError("Failed to fetch venue details")
 
-        return data["data"]["venue"]
-
 
-def create_venue_user_in_supabase(venue):
-    user_payload = {
+class EventListingsFetcher:
+    """
+    Fetch event listings for an area and date range from RA.co.
+    """
+
+    def __init__(self, areas, listing_date_gte, listing_date_lte, page_size=20):
+        self.payload = self.generate_payload(areas, listing_date_gte, listing_date_lte, page_size)
+
+    @staticmethod
+    def generate_payload(areas, listing_date_gte, listing_date_lte, page_size=20):
+        """
+        Generate the payload for the GraphQL request from graphql_query_template.json.
+
+        :param areas: The area code to filter events.
+        :param listing_date_gte: The start date for event listings (inclusive).
+        :param listing_date_lte: The end date for event listings (inclusive).
+        :param page_size: Number of listings per page.
+        :return: The generated payload.
+        """
+        with open(QUERY_TEMPLATE_PATH, "r") as file:
+            payload = json.load(file)
+
+        payload["variables"]["filters"]["areas"]["eq"] = areas
+        payload["variables"]["filters"]["listingDate"]["gte"] = listing_date_gte
+        payload["variables"]["filters"]["listingDate"]["lte"] = listing_date_lte
+        payload["variables"]["pageSize"] = page_size
+
+        return payload
+
+    def iter_events(self, page_number):
+        """
+        Stream the listings of one page, yielding each listing as soon as it
+        has been received. Memory stays bounded by a single listing, so
+        large page sizes are safe. A body that is not valid JSON ends the
+        page like an empty one. A body that breaks off after some listings
+        were yielded (corrupt JSON or a dropped connection) raises, so the
+        listings already received are never mistaken for a complete page.
+        A GraphQL "errors" response without any listings raises ValueError.
+
+        :param page_number: The page number for event listings.
+        :return: A generator of listings.
+        """
+        self.payload["variables"]["page"] = page_number
+        with requests.post(URL, headers=HEADERS, json=self.payload, stream=True) as response:
+            try:
+                response.raise_for_status()
+            except requests.exceptions.RequestException:
+                print(f"Error: {response.status_code}")
+                return
+
+            chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+            document = {}
+            received = 0
+            try:
+                for listing in iter_json_array(chunks, ("data", "eventListings", "data"), root=document):
+                    received += 1
+                    yield listing
+            except (ValueError, requests.exceptions.RequestException) as e:
+                print(f"Error: {response.status_code}")
+                if received:
+                    print(f"Page {page_number} broke off after {received} listings: {e}")
+                    raise
+                return
+
+        if "errors" in document:
+            print(f"Error: {document['errors']}")
+            # Partial data with field errors is still usable; an empty page is not.
+            if not received:
+                raise ValueError(f"RA.co returned errors for page {page_number}: {document['errors']}")
+
+    def iter_all_events(self):
+        """
+        Stream the listings of every page until an empty page is returned.
+
+        :return: A generator of listings.
+        """
+        page_number = 1
+
+        while True:
+            received = 0
+            for listing in self.iter_events(page_number):
+                received += 1
+                yield listing
+
+            if not received:
+                break
+            page_number += 1
+            time.sleep(DELAY)
+
+
+def build_venue_user_payload(venue):
+    return {
         "username": venue["name"],
         "email": f"venue_{venue['id']}@dummy.com",
         "password_hash": "hashed_dummy_password",
@@ -119,8 +235,12 @@ def create_venue_user_in_supabase(venue):
         "website_url": f"https://ra.co{venue.get('contentUrl','')}",  # For example
         "profile_picture_url": venue.get("logoUrl", ""),
     }
+
+
+def create_venue_user_in_supabase(venue):
+    user_payload = build_venue_user_payload(venue)
     try:
-        response = supabase.table("users").insert(user_payload).execute()
+        response = get_supabase().table("users").insert(user_payload).execute()
         if response.data:
             return response.data[0]["id"]
         else:
@@ -159,8 +279,8 @@ def parse_ra_event_to_ticket(event, venue):
     return parsed_data
 
 
-def upload_event_ticket_to_supabase(parsed_data, user_id):
-    ticket_payload = {
+def build_event_ticket_payload(parsed_data, user_id):
+    return {
         "event_date": parsed_data.get("event_date"),
         "title": parsed_data.get("title"),
         "cover_image": parsed_data.get("cover_image"),
@@ -183,8 +303,11 @@ def upload_event_ticket_to_supabase(parsed_data, user_id):
         "main_creator_name": parsed_data.get("host", None),
     }
 
+
+def upload_event_ticket_to_supabase(parsed_data, user_id):
+    ticket_payload = build_event_ticket_payload(parsed_data, user_id)
     try:
-        response = supabase.table("tickets").insert(ticket_payload).execute()
+        response = get_supabase().table("tickets").insert(ticket_payload).execute()
         if response.data:
             return {"ticket_id": response.data[0]["id"]}
         else:
@@ -194,30 +317,104 @@ def upload_event_ticket_to_supabase(parsed_data, user_id):
         raise e
 
 
-def fetch_and_upload_venue_events(venue_id):
-    venue_fetcher = VenueFetcher(venue_id)
-    venue_details = venue_fetcher.get_venue_details()
-
-    # Create or retrieve a user for this venue
-    venue_user_id = create_venue_user_in_supabase(venue_details)
-
-    # For each event in this venue, parse it & upload
-    events = venue_details.get("events", [])
-    for event in events:
-        parsed_data = parse_ra_event_to_ticket(event, venue_details)
-        upload_event_ticket_to_supabase(parsed_data, venue_user_id)
-
-    print(f"Successfully uploaded {len(events)} events for venue {venue_id}.")
+def fetch_and_upload_venue_events(venue_id, event_limit=50, dry_run=False):
+    """
+    Create a user for the venue and upload its events as tickets. With
+    `dry_run` nothing is written: the user and ticket payloads that would
+    have been inserted are returned instead (tickets have no creator id).
+
+    Each ticket is inserted while the RA.co response is still being read,
+    which keeps memory bounded by one event. The trade-off is that a slow
+    Supabase write pauses reading the body, and for a very large
+    `event_limit` RA.co may drop the connection mid-import. Any error, from
+    the stream or from an insert, stops the import after the events already
+    uploaded; that count is printed before the error is re-raised. Use
+    `dry_run` first to check a large import without writing anything.
+    """
+    venue_fetcher = VenueFetcher(venue_id, event_limit)
+    venue_details = {}
+    venue_user_id = None
+    uploaded = 0
+
+    if dry_run:
+        tickets = [
+            build_event_ticket_payload(parse_ra_event_to_ticket(event, venue_details), None)
+            for event in venue_fetcher.iter_venue_events(venue_details)
+        ]
+        return {"user": build_venue_user_payload(venue_details), "tickets": tickets}
+
+    # Events are decoded one at a time as the response arrives
+    try:
+        for event in venue_fetcher.iter_venue_events(venue_details):
+            if venue_user_id is None:
+                # Create or retrieve a user for this venue
+                venue_user_id = create_venue_user_in_supabase(venue_details)
+
+            parsed_data = parse_ra_event_to_ticket(event, venue_details)
+            upload_event_ticket_to_supabase(parsed_data, venue_user_id)
+            uploaded += 1
+    except Exception as e:
+        print(f"Stopped after uploading {uploaded} events for venue {venue_id}: {e}")
+        raise
+
+    if venue_user_id is None:
+        create_venue_user_in_supabase(venue_details)
+
+    print(f"Successfully uploaded {uploaded} events for venue {venue_id}.")
+
+
+def print_listing_details(listing):
+    """
+    Print the details of one event listing.
+    """
+    event_data = listing["event"]
+    print(f"Event name: {event_data['title']}")
+    print(f"Date: {event_data['date']}")
+    print(f"Start Time: {event_data['startTime']}")
+    print(f"End Time: {event_data['endTime']}")
+    print(f"Artists: {[artist['name'] for artist in event_data['artists']]}")
+    print(f"Venue: {event_data['venue']['name']}")
+    print(f"Event URL: {event_data['contentUrl']}")
+    print(f"Number of guests attending: {event_data['attending']}")
+    print("-" * 80)
+
+
+def save_listings(listings, output_file="events.csv"):
+    """
+    Write listings to a CSV file, or to a JSON file when `output_file` ends
+    in ".json". Listings are written as they arrive, so a streaming iterator
+    is never held in memory as a whole.
+
+    :return: The number of listings written.
+    """
+    count = 0
+    with open(output_file, "w", newline="", encoding="utf-8") as file:
+        if output_file.endswith(".json"):
+            file.write("[")
+            for listing in listings:
+                file.write(",\n" if count else "\n")
+                json.dump(listing, file)
+                count += 1
+            file.write("\n]\n")
+            return count
+
+        writer = csv.writer(file)
+        writer.writerow(["Event name", "Date", "Start Time", "End Time", "Artists",
+                         "Venue", "Event URL", "Number of guests attending"])
+        for listing in listings:
+            event_data = listing["event"]
+            writer.writerow([event_data['title'], event_data['date'], event_data['startTime'],
+                             event_data['endTime'], ', '.join([artist['name'] for artist in event_data['artists']]),
+                             event_data['venue']['name'], event_data['contentUrl'], event_data['attending']])
+            count += 1
+    return count
 
 
 def main():
-    parser = argparse.ArgumentParser(
-        description="Fetch venue details from RA.co, create a venue user, and create events as tickets in Supabase."
-    )
-    parser.add_argument("venue_id", type=str, help="The ID of the RA.co venue (e.g., 137474).")
-    args = parser.parse_args()
+    # Kept for `python event_fetcher.py ...`; the options live in cli.py's `venue` command
+    from cli import main as cli_main
 
-    fetch_and_upload_venue_events(args.venue_id)
+    cli_main(["venue", *sys.argv[1:]])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,145 @@
+import codecs
+import json
+
+# Decodes JSON arrays item by item while the response body is still arriving,
+# so only one item (plus the unread part of the current chunk) is held in memory
+# instead of the raw bytes, the decoded text and the whole object tree at once.
+
+WHITESPACE = " \t\n\r"
+NUMBER_CHARS = "0123456789+-.eE"
+
+
+class _ChunkReader:
+    """
+    A text buffer fed from an iterator of byte chunks. Consumed text is
+    dropped as soon as the next chunk is appended.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self.buffer = self.buffer[self.pos:] + text
+                self.pos = 0
+                return True
+        self.buffer = self.buffer[self.pos:] + self._decoder.decode(b"", final=True)
+        self.pos = 0
+        self.eof = True
+        return False
+
+    def peek(self):
+        """
+        Return the next non-whitespace character without consuming it
+        ("" at the end of the body).
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+        self.pos += 1
+
+    def _number_continues(self, value, end):
+        return (isinstance(value, (int, float)) and not isinstance(value, bool)
+                and self.buffer[end] in NUMBER_CHARS)
+
+    def decode_value(self):
+        """
+        Decode one complete JSON value at the current position, reading
+        more chunks until it is complete.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                # The buffer is re-sliced even when this reaches the end, so always decode again
+                self._fill()
+                continue
+            # A number or literal that ends at the buffer edge may be cut in
+            # half ("12" of "123"), and a number can also stop early at a
+            # character that only the next chunk completes ("89" of "89.5",
+            # split after the "."); only trust it once more text follows.
+            if not self.eof and (end == len(self.buffer) or self._number_continues(value, end)):
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+
+def _walk(reader, path, siblings, root=None):
+    if not path:
+        if reader.peek() != "[":
+            reader.decode_value()
+            return
+        reader.expect("[")
+        if reader.peek() == "]":
+            reader.pos += 1
+            return
+        while True:
+            yield reader.decode_value()
+            if reader.peek() == ",":
+                reader.pos += 1
+                continue
+            reader.expect("]")
+            return
+
+    if reader.peek() != "{":
+        reader.decode_value()
+        return
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+    while True:
+        key = reader.decode_value()
+        reader.expect(":")
+        if key == path[0]:
+            yield from _walk(reader, path[1:], siblings)
+        elif len(path) == 1 and siblings is not None:
+            siblings[key] = reader.decode_value()
+        elif root is not None:
+            root[key] = reader.decode_value()
+        else:
+            reader.decode_value()
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("}")
+        return
+
+
+def iter_json_array(chunks, path, siblings=None, root=None):
+    """
+    Yield the items of the array found at `path` in a JSON document, one at a
+    time, while the document is read from `chunks` (an iterable of bytes).
+
+    :param chunks: Byte chunks, e.g. response.iter_content(chunk_size=65536).
+    :param path: Object keys leading to the array, e.g. ("data", "eventListings", "data").
+    :param siblings: Optional dict that receives the other fields of the object
+                     holding the array (e.g. the venue's name next to its events).
+    :param root: Optional dict that receives the other top-level fields of the
+                 document (e.g. a GraphQL "errors" list next to "data").
+    :return: A generator of decoded array items.
+    """
+    reader = _ChunkReader(chunks)
+    yield from _walk(reader, tuple(path), siblings, root)
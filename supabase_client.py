@@ -0,0 +1,22 @@
+import threading
+
+from config import get_settings
+
+_client = None
+_lock = threading.Lock()
+
+
+def get_supabase():
+    """
+    Return the shared Supabase client, creating it on first use so that
+    commands which never write to the database don't import supabase or
+    need credentials.
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            from supabase import create_client
+
+            settings = get_settings()
+            _client = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
+        return _client
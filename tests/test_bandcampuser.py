@@ -0,0 +1,211 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("bs4")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import bandcampuser  # noqa: E402
+from bandcampuser import (  # noqa: E402
+    BandcampConnectionPool,
+    collect_bandcamp_artist_urls,
+    import_bandcamp_artists,
+    normalize_bandcamp_artist_url,
+    parse_bandcamp_label_artists_page,
+    read_bandcamp_artist_list,
+)
+
+LABEL_URL = "https://somelabel.bandcamp.com/artists"
+
+LABEL_PAGE = """
+<html><body>
+<ol class="featured-grid">
+  <li class="featured-item"><a href="https://first.bandcamp.com?label=1&amp;tab=artists">First</a></li>
+</ol>
+<ol class="editable-grid artists-grid">
+  <li class="artists-grid-item"><a href="https://second.bandcamp.com/?label=1&amp;tab=artists">Second</a></li>
+  <li class="artists-grid-item"><a href="/album/label-compilation">Label's own release</a></li>
+  <li class="artists-grid-item"><a href="https://first.bandcamp.com?label=1&amp;tab=artists">First again</a></li>
+  <li class="artists-grid-item">No link</li>
+  <li class="artists-grid-item"><a href="https://third.bandcamp.com/music">Third</a></li>
+</ol>
+<ul><li><a href="https://unrelated.bandcamp.com">Not an artist item</a></li></ul>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://artist.bandcamp.com?label=1&tab=artists", "https://artist.bandcamp.com/music"),
+    ("https://artist.bandcamp.com/album/some-album", "https://artist.bandcamp.com/music"),
+    ("  artist.bandcamp.com  ", "https://artist.bandcamp.com/music"),
+    ("http://artist.bandcamp.com/music", "http://artist.bandcamp.com/music"),
+])
+def test_normalize_bandcamp_artist_url(url, expected):
+    assert normalize_bandcamp_artist_url(url) == expected
+
+
+def test_label_page_skips_own_links_and_keeps_first_occurrence():
+    assert parse_bandcamp_label_artists_page(LABEL_PAGE, LABEL_URL) == [
+        "https://first.bandcamp.com/music",
+        "https://second.bandcamp.com/music",
+        "https://third.bandcamp.com/music",
+    ]
+
+
+def test_read_artist_list_ignores_blank_and_comment_lines(tmp_path):
+    path = tmp_path / "artists.txt"
+    path.write_text("# roster\nfirst.bandcamp.com\n\n   \n  # second is on hold\nhttps://third.bandcamp.com/album/x\n")
+
+    assert read_bandcamp_artist_list(str(path)) == [
+        "https://first.bandcamp.com/music",
+        "https://third.bandcamp.com/music",
+    ]
+
+
+def test_collect_artist_urls_merges_sources_in_order(tmp_path):
+    path = tmp_path / "artists.txt"
+    path.write_text("third.bandcamp.com\nfirst.bandcamp.com\n")
+
+    class LabelHttp:
+        def get(self, url, **kwargs):
+            assert url == LABEL_URL
+            return FakeResponse(LABEL_PAGE)
+
+    urls = collect_bandcamp_artist_urls(
+        ["https://first.bandcamp.com/music", "https://fourth.bandcamp.com"],
+        [LABEL_URL],
+        str(path),
+        LabelHttp(),
+    )
+
+    assert urls == [
+        "https://first.bandcamp.com/music",
+        "https://fourth.bandcamp.com/music",
+        "https://third.bandcamp.com/music",
+        "https://second.bandcamp.com/music",
+    ]
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class InFlightSession:
+    """
+    Stands in for requests.Session: every GET takes `delay` seconds and the
+    peak number of concurrent requests is recorded overall and per host.
+    """
+
+    def __init__(self, pages, delay=0.02):
+        self.pages = pages
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.total = 0
+        self.hosts = Counter()
+        self.peak_total = 0
+        self.peak_hosts = Counter()
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        host = urlsplit(url).netloc
+        with self.lock:
+            self.requests += 1
+            self.total += 1
+            self.hosts[host] += 1
+            self.peak_total = max(self.peak_total, self.total)
+            self.peak_hosts[host] = max(self.peak_hosts[host], self.hosts[host])
+        try:
+            time.sleep(self.delay)
+            return FakeResponse(self.pages(url))
+        finally:
+            with self.lock:
+                self.total -= 1
+                self.hosts[host] -= 1
+
+    def close(self):
+        pass
+
+
+def test_connection_pool_enforces_global_and_per_host_limits():
+    session = InFlightSession(lambda url: "")
+    pool = BandcampConnectionPool(max_connections=3, per_host=2)
+    pool.session = session
+    urls = [f"https://host{i % 4}.bandcamp.com/track/{i}" for i in range(24)]
+
+    threads = [threading.Thread(target=pool.get, args=(url,)) for url in urls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert session.peak_total == 3
+    assert max(session.peak_hosts.values()) <= 2
+
+
+def artist_pages(url):
+    parts = urlsplit(url)
+    if parts.path == "/music":
+        releases = "".join(
+            f'<li class="music-grid-item"><a href="/album/a{i}"><p class="title">A{i}</p></a></li>'
+            for i in range(20)
+        )
+        return (f'<p id="band-name-location"><span class="title">{parts.netloc}</span></p>'
+                f'<ol id="music-grid">{releases}</ol>')
+    return '<h2 class="trackTitle">Release</h2>'
+
+
+def test_bulk_import_fills_global_limit_without_exceeding_per_host(capsys):
+    session = InFlightSession(artist_pages, delay=0.05)
+    pool = BandcampConnectionPool(max_connections=8, per_host=2)
+    pool.session = session
+    artist_urls = [f"https://artist{i}.bandcamp.com/music" for i in range(8)]
+
+    started = time.perf_counter()
+    reports = import_bandcamp_artists(artist_urls, max_artists=4, max_connections=8, dry_run=True, http=pool)
+    average_in_flight = session.requests * session.delay / (time.perf_counter() - started)
+
+    assert [report["imported"] for report in reports] == [20] * 8
+    assert session.peak_total == 8
+    assert max(session.peak_hosts.values()) <= 2
+    # The peak alone is reached briefly even when most workers sit blocked on
+    # one host's limit; that kept the average near 3 of 8.
+    assert average_in_flight >= 6
+
+
+def test_parse_failure_is_recorded_and_other_releases_continue(monkeypatch, capsys):
+    parse = bandcampuser.parse_bandcamp_html
+
+    def flaky_parse(html_content):
+        if "Broken" in html_content:
+            raise RuntimeError("unexpected markup")
+        return parse(html_content)
+
+    def pages(url):
+        if url.endswith("/album/a3"):
+            return '<h2 class="trackTitle">Broken</h2>'
+        return artist_pages(url)
+
+    monkeypatch.setattr(bandcampuser, "parse_bandcamp_html", flaky_parse)
+    pool = BandcampConnectionPool()
+    pool.session = InFlightSession(pages, delay=0)
+
+    [report] = import_bandcamp_artists(["https://artist.bandcamp.com/music"], dry_run=True, http=pool)
+
+    assert report["error"] is None
+    assert report["imported"] == 19
+    assert report["failures"] == [
+        {"url": "https://artist.bandcamp.com/album/a3", "error": "parse failed: unexpected markup"}
+    ]
@@ -0,0 +1,135 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import cli  # noqa: E402
+
+VENUE_BODY = json.dumps({"data": {"venue": {
+    "id": "137474", "name": "Stub Venue", "logoUrl": "", "blurb": "", "address": "Somewhere 1",
+    "contentUrl": "/clubs/137474",
+    "events": [
+        {"id": str(i), "title": f"Event {i}", "date": "2024-05-01T00:00:00.000",
+         "images": [{"filename": f"https://images.ra.co/{i}.jpg"}], "artists": [{"name": "Artist"}]}
+        for i in range(3)
+    ],
+}}}).encode()
+
+# Runs a venue dry-run in a fresh interpreter against a stubbed RA.co response
+# and reports which of the database modules got imported along the way.
+DRY_RUN_SCRIPT = f"""
+import json, os, sys
+import requests
+
+BODY = {VENUE_BODY!r}
+
+class StubResponse:
+    status_code = 200
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        return False
+    def raise_for_status(self):
+        pass
+    def iter_content(self, chunk_size=1):
+        yield BODY
+
+requests.post = lambda *args, **kwargs: StubResponse()
+
+import cli
+cli.main(["venue", "137474", "--dry-run", "-o", os.devnull])
+print(json.dumps(sorted(name for name in ("supabase", "dotenv") if name in sys.modules)))
+"""
+
+
+def test_dry_run_never_imports_database_modules():
+    pytest.importorskip("requests")
+
+    result = subprocess.run([sys.executable, "-c", DRY_RUN_SCRIPT], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+def test_help_imports_only_the_standard_library():
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, cli; print(sorted(m for m in ('requests', 'bs4', 'supabase', 'dotenv') "
+                               "if m in sys.modules))"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+class StubResponse:
+    status_code = 200
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(VENUE_BODY), 32):
+            yield VENUE_BODY[i:i + 32]
+
+
+def test_venue_dry_run_stdout_is_valid_json(monkeypatch, capsys):
+    requests = pytest.importorskip("requests")
+    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: StubResponse())
+
+    cli.main(["venue", "137474", "--dry-run"])
+
+    payloads = json.loads(capsys.readouterr().out)
+    assert payloads["user"]["username"] == "Stub Venue"
+    assert [ticket["title"] for ticket in payloads["tickets"]] == ["Event 0", "Event 1", "Event 2"]
+    assert all(ticket["main_creator_id"] is None for ticket in payloads["tickets"])
+
+
+class PageResponse:
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+def test_bandcamp_dry_run_stdout_is_valid_json(monkeypatch, capsys):
+    requests = pytest.importorskip("requests")
+    pytest.importorskip("bs4")
+    main_page = ('<p id="band-name-location"><span class="title">Stub Artist</span></p>'
+                 '<ol id="music-grid"><li class="music-grid-item"><a href="/album/a"></a></li></ol>')
+
+    def get(self, url, **kwargs):
+        return PageResponse(main_page if url.endswith("/music") else '<h2 class="trackTitle">A</h2>')
+
+    monkeypatch.setattr(requests.Session, "get", get)
+
+    cli.main(["bandcamp", "https://stub.bandcamp.com", "--dry-run"])
+
+    captured = capsys.readouterr()
+    [payload] = json.loads(captured.out)
+    assert payload["user"]["display_name"] == "StubArtist"
+    assert [ticket["title"] for ticket in payload["tickets"]] == ["A"]
+    # Progress and the import report still reach the user, on stderr
+    assert "Bandcamp import report" in captured.err
+
+
+@pytest.mark.parametrize("command", [["venue", "137474"], ["bandcamp", "https://stub.bandcamp.com"]])
+def test_output_without_dry_run_is_rejected(command, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main([*command, "-o", "payloads.json"])
+
+    assert exit_info.value.code == 2
+    assert "--dry-run" in capsys.readouterr().err
@@ -0,0 +1,110 @@
+import json
+import os
+import sys
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import event_fetcher  # noqa: E402
+from event_fetcher import EventListingsFetcher, VenueFetcher  # noqa: E402
+
+
+class StreamedResponse:
+    """
+    Stands in for a streamed requests response. The body is served in small
+    chunks; `error` is raised from iter_content once the body is used up.
+    """
+
+    status_code = 200
+
+    def __init__(self, body, error=None):
+        self.body = body
+        self.error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.body), 16):
+            yield self.body[i:i + 16]
+        if self.error:
+            raise self.error
+
+
+def listings_page(count):
+    data = [{"id": str(i), "event": {"title": f"Event {i}"}} for i in range(count)]
+    return json.dumps({"data": {"eventListings": {"data": data, "totalResults": count}}}).encode()
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    queue = []
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: queue.pop(0))
+    monkeypatch.setattr(event_fetcher.time, "sleep", lambda seconds: None)
+    return queue
+
+
+def fetcher():
+    return EventListingsFetcher(13, "2024-05-01T00:00:00.000Z", "2024-05-02T23:59:59.999Z", page_size=100)
+
+
+def test_pages_are_streamed_until_an_empty_page(responses):
+    responses.extend([StreamedResponse(listings_page(3)), StreamedResponse(listings_page(0))])
+
+    assert [listing["id"] for listing in fetcher().iter_all_events()] == ["0", "1", "2"]
+
+
+def test_truncated_page_raises_instead_of_moving_on(responses, capsys):
+    responses.extend([StreamedResponse(listings_page(100)[:400]), StreamedResponse(listings_page(0))])
+    received = []
+
+    with pytest.raises(ValueError):
+        for listing in fetcher().iter_all_events():
+            received.append(listing)
+
+    assert 0 < len(received) < 100
+    assert len(responses) == 1
+
+
+def test_dropped_connection_after_listings_raises(responses, capsys):
+    error = requests.exceptions.ChunkedEncodingError("connection broken")
+    responses.append(StreamedResponse(listings_page(5)[:200], error=error))
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        list(fetcher().iter_all_events())
+
+
+@pytest.mark.parametrize("response", [
+    StreamedResponse(b"<html>Too many requests</html>"),
+    StreamedResponse(b"", error=requests.exceptions.ConnectionError("reset")),
+])
+def test_unusable_page_without_listings_ends_like_an_empty_page(responses, response, capsys):
+    responses.append(response)
+
+    assert list(fetcher().iter_all_events()) == []
+    assert "Error: 200" in capsys.readouterr().out
+
+
+def test_graphql_errors_without_data_raise(responses, capsys):
+    responses.append(StreamedResponse(b'{"errors": [{"message": "rate limited"}], "data": null}'))
+
+    with pytest.raises(ValueError, match="rate limited"):
+        list(fetcher().iter_all_events())
+
+
+def test_get_venue_details_collects_streamed_events(responses):
+    body = {"data": {"venue": {"id": "1", "name": "Shelter", "events": [{"id": "a"}, {"id": "b"}]}}}
+    responses.append(StreamedResponse(json.dumps(body).encode()))
+
+    assert VenueFetcher("1").get_venue_details() == body["data"]["venue"]
@@ -0,0 +1,120 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from json_stream import iter_json_array  # noqa: E402
+
+LISTINGS_PATH = ("data", "eventListings", "data")
+VENUE_PATH = ("data", "venue", "events")
+
+
+def chunked(raw, size):
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+def listings_document():
+    listings = [
+        {"id": str(i), "title": "Nachtwacht – Ümlaut 夜 " * (i % 3), "attending": i * 1001,
+         "price": 12.5 + i, "pick": None, "isTicketed": i % 2 == 0}
+        for i in range(40)
+    ]
+    return {"data": {"eventListings": {"data": listings, "totalResults": 40}}}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64, 1 << 20])
+def test_items_survive_any_chunking(chunk_size):
+    document = listings_document()
+    raw = json.dumps(document, ensure_ascii=False, indent=1).encode("utf-8")
+
+    items = list(iter_json_array(chunked(raw, chunk_size), LISTINGS_PATH))
+
+    assert items == document["data"]["eventListings"]["data"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7])
+def test_numbers_split_at_chunk_edge(chunk_size):
+    raw = b'{"data": {"eventListings": {"data": [1234567, 89.125e3, -42, true, null]}}}'
+
+    items = list(iter_json_array(chunked(raw, chunk_size), LISTINGS_PATH))
+
+    assert items == [1234567, 89.125e3, -42, True, None]
+
+
+def test_only_the_requested_path_is_yielded():
+    document = {
+        "data": {
+            "events": [{"id": "wrong"}],
+            "venue": {
+                "name": "Shelter",
+                "address": "Overhoeksplein 3",
+                "topArtists": [{"name": "A", "events": ["nested"]}],
+                "events": [{"id": "1", "venue": {"events": ["nested"]}}, {"id": "2"}],
+                "eventCountThisYear": 12,
+            },
+        }
+    }
+    raw = json.dumps(document).encode("utf-8")
+    venue = {}
+
+    items = list(iter_json_array(chunked(raw, 3), VENUE_PATH, siblings=venue))
+
+    assert items == document["data"]["venue"]["events"]
+    assert venue == {
+        "name": "Shelter",
+        "address": "Overhoeksplein 3",
+        "topArtists": [{"name": "A", "events": ["nested"]}],
+        "eventCountThisYear": 12,
+    }
+
+
+def test_root_captures_top_level_errors():
+    raw = b'{"errors": [{"message": "rate limited"}], "data": null}'
+    root = {}
+
+    items = list(iter_json_array(chunked(raw, 4), LISTINGS_PATH, root=root))
+
+    assert items == []
+    assert root == {"errors": [{"message": "rate limited"}]}
+
+
+@pytest.mark.parametrize("raw", [
+    b'{"data": {"eventListings": {"data": []}}}',
+    b'{"data": {"eventListings": null}}',
+    b'{"data": {}}',
+    b'{}',
+])
+def test_empty_or_missing_array_yields_nothing(raw):
+    assert list(iter_json_array(chunked(raw, 2), LISTINGS_PATH)) == []
+
+
+def test_html_body_raises():
+    raw = b"<html><body>Too many requests</body></html>"
+
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(chunked(raw, 5), LISTINGS_PATH))
+
+
+def test_truncated_body_raises_after_complete_items():
+    raw = json.dumps(listings_document()).encode("utf-8")[:300]
+    received = []
+
+    with pytest.raises(ValueError):
+        for item in iter_json_array(chunked(raw, 7), LISTINGS_PATH):
+            received.append(item)
+
+    assert received == listings_document()["data"]["eventListings"]["data"][:len(received)]
+
+
+def test_number_at_end_of_last_chunk():
+    chunks = [b'{"data": {"eventListings": {"data": [1, 2', b'5', b"]}}}"]
+
+    assert list(iter_json_array(chunks, LISTINGS_PATH)) == [1, 25]
+
+
+def test_truncated_number_at_end_of_body_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"data": {"eventListings": {"data": [89.'], LISTINGS_PATH))